@@ -2,22 +2,207 @@
 import streamlit as st
 import pandas as pd
 import requests
+import hashlib
+import sys
+import threading
 import time
 import json
+import random
 import re
-from urllib.parse import quote_plus
-from fake_useragent import UserAgent
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import chain
+from urllib.parse import parse_qs, quote_plus, urlparse
+from urllib3.util.retry import Retry
 
-# Initialize fake user agent
-ua = UserAgent()
+# Shared placeholder value: every missing field points at this one interned
+# string instead of a fresh literal per row, and == checks against it can
+# short-circuit on identity
+NA = sys.intern("N/A")
 
-def get_initial_data(keyword):
-    """Get initial search results from Google Maps"""
-    query = quote_plus(keyword)
-    url = f"https://www.google.com/maps/search/{query}"
+_FALLBACK_UA = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+
+@lru_cache(maxsize=1)
+def _ua_pool():
+    """Pre-sample a pool of UA strings; every ua.random draw does repeated
+    fake_useragent internal work, so pay that 32 times total, not per request"""
+    try:
+        from fake_useragent import UserAgent
+        generator = UserAgent()
+        return tuple(generator.random for _ in range(32))
+    except Exception:
+        return (_FALLBACK_UA,)
+
+
+def random_user_agent():
+    """Return a rotating User-Agent, falling back to a static one"""
+    return random.choice(_ua_pool())
+
+# Pre-compiled regex patterns (compiling once at import beats re's cache
+# lookup inside the per-listing parsing loop)
+_RATING_RE = re.compile(r'(\d\.\d)\s?★')
+# [^()]* instead of .*? keeps the fused pattern backtrack-free
+_RATING_REVIEWS_RE = re.compile(r'(?P<rating>\d\.\d)\s?★[^()]*\((?P<reviews>\d{1,3}(?:,\d{3})*)\)')
+_REVIEWS_RE = re.compile(r'\((\d{1,3}(?:,\d{3})*)\)')
+# Two specialized phone patterns instead of one with an optional prefix
+# group, which forces the engine to try both branches at every position
+_PHONE_INTL_RE = re.compile(r'\+\d{1,3}[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+_PHONE_LOCAL_RE = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+_HAS_DIGIT_RE = re.compile(r'\d')
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+
+def clean_text(text):
+    """Collapse whitespace runs to single spaces and trim"""
+    if not text:
+        return ""
+    stripped = text.strip()
+    # Most field strings are short with no inner runs; skip the regex
+    # engine (and its fresh string allocation) for those
+    if ('  ' not in stripped and '\t' not in stripped and '\n' not in stripped
+            and '\r' not in stripped and '\xa0' not in stripped):
+        return stripped
+    return ' '.join(stripped.split())
+
+# Keywords recur across Streamlit reruns and retry paths; memoize encoding
+_quote_plus_cached = lru_cache(maxsize=1024)(quote_plus)
+
+
+def _search_url(keyword):
+    """Build the Maps search URL for a keyword"""
+    return f"https://www.google.com/maps/search/{_quote_plus_cached(keyword)}"
+
+
+@lru_cache(maxsize=4096)
+def resolve_google_redirect(url):
+    """Unwrap Google /url? redirect links to the real target site
+
+    Pure and keyed on a single string, so repeated links (common across
+    cards) are resolved once; non-redirect URLs pass through untouched.
+    """
+    if not url.startswith(('https://www.google.com/url', 'http://www.google.com/url')):
+        return url
+    try:
+        params = parse_qs(urlparse(url).query)
+        target = params.get('q') or params.get('url')
+        return target[0] if target else url
+    except Exception:
+        return url
+
+
+# Fixed output schema: one DataFrame allocation, no reindexing
+COLUMNS = [
+    "Business Name",
+    "Email",
+    "Phone",
+    "Website",
+    "GMB Profile Link",
+    "Rating",
+    "Total Reviews",
+    "Address",
+    "Keyword",
+]
+
+
+@st.cache_data(show_spinner=False)
+def _results_to_csv(results):
+    """Serialize results to CSV bytes, cached so Streamlit reruns skip it"""
+    df = pd.DataFrame(results, columns=COLUMNS)
+    return df.to_csv(index=False, lineterminator='\n').encode('utf-8')
+
+
+def _build_session():
+    """Build a shared session so repeated requests reuse TCP/TLS connections"""
+    session = requests.Session()
+    # Honor Retry-After on 429/503 (urllib3 does this by default) and back
+    # off exponentially otherwise, instead of sleeping blindly between hits
+    retries = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+    )
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=4, pool_maxsize=10, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# Shared session: one TLS handshake to google.com instead of one per request
+_session = _build_session()
+
+
+class _RateLimiter:
+    """Adaptive token-bucket limiter shared by the scrape workers
+
+    Admits one request per interval with a little jitter. The interval
+    doubles when a worker reports being blocked and decays back toward the
+    user-configured base on success, so fast unthrottled runs don't pay a
+    flat worst-case sleep.
+    """
+
+    def __init__(self, base_interval=3.0):
+        self._lock = threading.Lock()
+        self.base_interval = float(base_interval)
+        self.interval = float(base_interval)
+        self._next_at = 0.0
+
+    def configure(self, base_interval):
+        with self._lock:
+            self.base_interval = float(base_interval)
+            self.interval = float(base_interval)
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval + random.uniform(0, 0.5)
+        if wait > 0:
+            time.sleep(wait)
+
+    def report_block(self):
+        with self._lock:
+            self.interval = min(self.interval * 2, 60.0)
+
+    def report_success(self):
+        with self._lock:
+            self.interval = max(self.base_interval, self.interval * 0.9)
+
+
+_rate_limiter = _RateLimiter()
+
+# ASCII markers of Google's block/interstitial pages
+_BLOCK_MARKERS = (
+    b'Our systems have detected unusual traffic',
+    b'/sorry/index',
+)
+
+
+def _blocked(content):
+    """Bytes-level CAPTCHA/interstitial check, run before any parsing"""
+    for marker in _BLOCK_MARKERS:
+        if marker in content:
+            _rate_limiter.report_block()
+            return True
+    return False
+
+def get_initial_data(keyword, url=None, errors=None):
+    """Get initial search results from Google Maps
+
+    Runs inside worker threads, where st.* calls are silently dropped, so
+    problems are appended to the caller's ``errors`` list for the main
+    thread to render.
+    """
+    if errors is None:
+        errors = []
+    if url is None:
+        url = _search_url(keyword)
     
     headers = {
-        'User-Agent': ua.random,
+        'User-Agent': random_user_agent(),
         'Accept': '*/*',
         'Accept-Language': 'en-US,en;q=0.9',
         'Referer': 'https://www.google.com/',
@@ -25,142 +210,356 @@ def get_initial_data(keyword):
     }
     
     try:
-        response = requests.get(url, headers=headers, timeout=15)
+        response = _session.get(url, headers=headers, timeout=15)
         response.raise_for_status()
-        
-        # Extract initial data from response
-        match = re.search(r'window\.APP_INITIALIZATION_STATE=(.*?);window\.APP_FLAGS', response.text)
-        if match:
-            data = json.loads(match.group(1))
+
+        # Locate the literal marker with a C-level bytes search, then decode
+        # and JSON-parse only from that offset: pages without the blob are
+        # rejected without decoding anything
+        content = response.content
+        if _blocked(content):
+            errors.append(f"Google is rate-limiting requests for {keyword}; backing off")
+            return None
+
+        marker = b'window.APP_INITIALIZATION_STATE='
+        start = content.find(marker)
+        if start != -1:
+            tail = content[start + len(marker):].decode('utf-8', errors='replace')
+            data, _ = json.JSONDecoder().raw_decode(tail)
             return data
     except Exception as e:
-        st.error(f"Error fetching initial data for {keyword}: {str(e)}")
+        errors.append(f"Error fetching initial data for {keyword}: {str(e)}")
         return None
 
+def _dig(node, *indices):
+    """Safely walk nested lists/dicts by index, returning None on any mismatch"""
+    for index in indices:
+        try:
+            node = node[index]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return node
+
+def extract_businesses_from_app_state(data, keyword):
+    """Extract businesses from the APP_INITIALIZATION_STATE JSON blob
+
+    The blob embeds the same records the HTML shows, in structured form,
+    so walking the known indices replaces all the per-card HTML work.
+    Returns [] whenever the payload doesn't have the expected shape.
+    """
+    blob = _dig(data, 3, 2)
+    if not isinstance(blob, str):
+        return []
+
+    try:
+        payload = json.loads(blob[4:] if blob.startswith(")]}'") else blob)
+    except ValueError:
+        return []
+
+    results = _dig(payload, 0, 1)
+    if not isinstance(results, list):
+        return []
+
+    businesses = []
+    for result in results:
+        place = _dig(result, 14)
+        if not isinstance(place, list):
+            continue
+
+        # Field values get the same shape checks as the containers: an
+        # off-shape blob must degrade to NA (or skip the row), never leak
+        # a non-string into the row dicts or the (name, address) dedupe keys
+        name = _dig(place, 11)
+        if not isinstance(name, str) or not name:
+            continue
+
+        address = _dig(place, 39)
+        if not isinstance(address, str) or not address:
+            address_lines = _dig(place, 2)
+            if isinstance(address_lines, list):
+                address = ', '.join(
+                    line for line in address_lines if isinstance(line, str))
+            else:
+                address = ''
+            if not address:
+                address = NA
+
+        rating = _dig(place, 4, 7)
+        reviews = _dig(place, 4, 8)
+        phone = _dig(place, 178, 0, 0)
+        if not isinstance(phone, str):
+            phone = None
+        website = _dig(place, 7, 0)
+        if isinstance(website, str) and website:
+            website = resolve_google_redirect(website)
+        else:
+            website = None
+        place_id = _dig(place, 78)
+        profile_link = (f"https://www.google.com/maps/place/?q=place_id:{place_id}"
+                        if place_id else NA)
+
+        businesses.append({
+            "Business Name": name,
+            "Email": NA,
+            "Phone": phone if phone else NA,
+            "Website": website if website else NA,
+            "GMB Profile Link": profile_link,
+            "Rating": str(rating) if rating is not None else NA,
+            "Total Reviews": str(reviews) if reviews is not None else NA,
+            "Address": address,
+            "Keyword": keyword
+        })
+
+    return businesses
+
+@lru_cache(maxsize=1)
+def _selectors():
+    """Compile the card and field selectors once, on first use"""
+    from lxml import etree
+    return {
+        'feed': etree.XPath('//div[@role="feed"]'),
+        'listings': etree.XPath('.//div[contains(@class, "bfdHYd")]'),
+        # string(...) selectors evaluate entirely in libxml2 and hand back
+        # the field text in one call, with no element objects or Python-side
+        # itertext join per field
+        'name': etree.XPath('string(.//div[contains(@class, "qBF1Pd")])'),
+        'rating': etree.XPath('string(.//span[contains(@class, "MW4etd")])'),
+        'reviews': etree.XPath('string(.//span[contains(@class, "UY7F9")])'),
+        'address': etree.XPath('string(.//div[contains(@class, "W4Efsd")])'),
+        'phone': etree.XPath('string(.//span[contains(@class, "UsdlK")])'),
+        'website': etree.XPath('.//a[contains(@class, "lcr4fd")]/@href'),
+        'profile': etree.XPath('.//a[contains(@class, "hfpxzc")]/@href'),
+    }
+
+def _xpath_text(element, selector):
+    """Evaluate a string(...) field selector, or "N/A" when nothing matches"""
+    text = clean_text(selector(element))
+    return text if text else NA
+
+def _listing_text(listing):
+    """Collect a card's visible text in one traversal of its subtree"""
+    return ' '.join(t.strip() for t in listing.itertext() if t.strip())
+
+def _extract_listing(listing, keyword):
+    """Pull the business fields out of a single result card element"""
+    sel = _selectors()
+
+    # Card text is only materialized if a class lookup misses; when all
+    # spans resolve (the common case) no text traversal happens at all
+    listing_text = None
+
+    # Business Name
+    name = _xpath_text(listing, sel['name'])
+
+    # Rating
+    rating = _xpath_text(listing, sel['rating'])
+
+    # Reviews Count
+    reviews = _xpath_text(listing, sel['reviews'])
+    if reviews != NA:
+        reviews_match = _REVIEWS_RE.search(reviews)
+        reviews = reviews_match.group(1) if reviews_match else reviews.replace('(', '').replace(')', '')
+
+    # Fallback: one fused scan of the card text fills rating and reviews
+    # together instead of two separate searches over the same string
+    if rating == NA:
+        if listing_text is None:
+            listing_text = _listing_text(listing)
+        if '★' in listing_text:
+            fused_match = _RATING_REVIEWS_RE.search(listing_text)
+            if fused_match:
+                rating = fused_match.group('rating')
+                if reviews == NA:
+                    reviews = fused_match.group('reviews')
+            else:
+                rating_match = _RATING_RE.search(listing_text)
+                if rating_match:
+                    rating = rating_match.group(1)
+
+    # Address/Category
+    address = _xpath_text(listing, sel['address'])
+
+    # Phone Number; cheap digit probe first, the phone pattern backtracks
+    phone = _xpath_text(listing, sel['phone'])
+    if phone == NA:
+        if listing_text is None:
+            listing_text = _listing_text(listing)
+        if _HAS_DIGIT_RE.search(listing_text):
+            phone_match = (_PHONE_INTL_RE.search(listing_text)
+                           or _PHONE_LOCAL_RE.search(listing_text))
+            if phone_match:
+                phone = phone_match.group(0)
+
+    # Website
+    website_href = sel['website'](listing)
+    website = resolve_google_redirect(website_href[0]) if website_href else NA
+
+    # Profile Link
+    profile_href = sel['profile'](listing)
+    profile_link = profile_href[0] if profile_href else NA
+
+    return {
+        "Business Name": name,
+        # Email (not typically available in search results)
+        "Email": NA,
+        "Phone": phone,
+        "Website": website,
+        "GMB Profile Link": profile_link,
+        "Rating": rating,
+        "Total Reviews": reviews,
+        "Address": address,
+        "Keyword": keyword
+    }
+
 def extract_businesses_from_html(html_content, keyword):
     """Extract business information from HTML content"""
-    from bs4 import BeautifulSoup
-    
-    soup = BeautifulSoup(html_content, 'html.parser')
+    from lxml import html as lxml_html
+
+    try:
+        tree = lxml_html.fromstring(html_content)
+    except Exception:
+        return []
+
     businesses = []
-    
-    # Find all business listings
-    listings = soup.find_all('div', {'class': 'bfdHYd'})
-    
-    for listing in listings:
-        try:
-            # Business Name
-            name_elem = listing.find('div', {'class': 'qBF1Pd'})
-            name = name_elem.text.strip() if name_elem else "N/A"
-            
-            # Rating
-            rating_elem = listing.find('span', {'class': 'MW4etd'})
-            rating = rating_elem.text.strip() if rating_elem else "N/A"
-            
-            # Reviews Count
-            reviews_elem = listing.find('span', {'class': 'UY7F9'})
-            reviews = reviews_elem.text.strip().replace('(', '').replace(')', '') if reviews_elem else "N/A"
-            
-            # Address/Category
-            address_elem = listing.find('div', {'class': 'W4Efsd'})
-            address = address_elem.text.strip() if address_elem else "N/A"
-            
-            # Phone Number
-            phone_elem = listing.find('span', {'class': 'UsdlK'})
-            phone = phone_elem.text.strip() if phone_elem else "N/A"
-            
-            # Website
-            website_elem = listing.find('a', {'class': 'lcr4fd'})
-            website = website_elem.get('href') if website_elem else "N/A"
-            
-            # Profile Link
-            profile_elem = listing.find('a', {'class': 'hfpxzc'})
-            profile_link = profile_elem.get('href') if profile_elem else "N/A"
-            
-            # Email (not typically available in search results)
-            email = "N/A"
-            
-            businesses.append({
-                "Business Name": name,
-                "Email": email,
-                "Phone": phone,
-                "Website": website,
-                "GMB Profile Link": profile_link,
-                "Rating": rating,
-                "Total Reviews": reviews,
-                "Address": address,
-                "Keyword": keyword
-            })
-            
-        except Exception as e:
-            st.warning(f"Error parsing listing: {str(e)}")
-            continue
-    
+
+    sel = _selectors()
+
+    # Scope the card scan to the results feed when present instead of
+    # walking every div in the document
+    feed = sel['feed'](tree)
+    root = feed[0] if feed else tree
+
+    # Find all business listings. Every field lookup in _extract_listing
+    # degrades to "N/A" on a miss, so no per-card exception guard is needed
+    listings = sel['listings'](root)
+    businesses.extend(_extract_listing(listing, keyword) for listing in listings)
+
     return businesses
 
-def scrape_with_pagination(keyword, max_pages=5):
-    """Scrape Google Maps with pagination simulation"""
+def extract_businesses_from_stream(chunks, keyword):
+    """Extract businesses from an iterable of page chunks without buffering
+
+    Feeds chunks into lxml's pull parser so result cards are parsed (and
+    freed) as the bytes arrive, instead of materializing the whole page as
+    a Python string and then a full tree.
+    """
+    from lxml import etree
+
+    parser = etree.HTMLPullParser(events=('end',))
     businesses = []
-    session = requests.Session()
-    
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, element in parser.read_events():
+            if element.tag == 'div' and 'bfdHYd' in element.get('class', ''):
+                businesses.append(_extract_listing(element, keyword))
+                element.clear()
+
+    return businesses
+
+def _fetch_page(url, headers):
+    """Fetch one pagination page after a small staggering jitter"""
+    time.sleep(random.uniform(0.2, 1.0))
+    try:
+        response = _session.get(url, headers=headers, timeout=15)
+        response.raise_for_status()
+        return response.content
+    except requests.RequestException:
+        return None
+
+def scrape_with_pagination(keyword, max_pages=5, base_url=None, errors=None):
+    """Scrape Google Maps with pagination simulation
+
+    Like get_initial_data, reports problems through ``errors`` because
+    st.* is a no-op in worker threads.
+    """
+    businesses = []
+    if errors is None:
+        errors = []
+
     headers = {
-        'User-Agent': ua.random,
+        'User-Agent': random_user_agent(),
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
         'Accept-Encoding': 'gzip, deflate',
         'Connection': 'keep-alive',
     }
-    
-    session.headers.update(headers)
-    
-    query = quote_plus(keyword)
-    base_url = f"https://www.google.com/maps/search/{query}"
+
+    if base_url is None:
+        base_url = _search_url(keyword)
     
     try:
-        response = session.get(base_url, timeout=15)
+        response = _session.get(base_url, headers=headers, timeout=15, stream=True)
         response.raise_for_status()
-        
-        # Extract businesses from initial page
-        page_businesses = extract_businesses_from_html(response.text, keyword)
-        businesses.extend(page_businesses)
+
+        # Paginated fetches mostly repeat the same cards, so filter on
+        # (name, address) while accumulating rather than keeping duplicates
+        # around until the global dedupe pass
+        seen = set()
+
+        def _add_new(rows):
+            for row in rows:
+                key = (row["Business Name"], row["Address"])
+                if key not in seen:
+                    seen.add(key)
+                    businesses.append(row)
+            return len(seen)
+
+        # Extract businesses from the initial page. The block markers sit
+        # early in the document, so probing the first chunk gives the
+        # streamed path the same interstitial detection as the buffered
+        # pagination bodies below
+        chunks = response.iter_content(chunk_size=16384)
+        first_chunk = next(chunks, b'')
+        if _blocked(first_chunk):
+            errors.append(f"Google is rate-limiting requests for {keyword}; backing off")
+            return businesses
+        _add_new(extract_businesses_from_stream(chain((first_chunk,), chunks), keyword))
         
         # Try to get more results by simulating scroll/pagination
         # This is a simplified approach - in reality, Google Maps uses complex JS
-        for page in range(1, max_pages):
-            # Add delay to simulate human behavior
-            time.sleep(2)
-            
-            # Try to get next page (this is a simplified approach)
-            next_url = f"{base_url}?page={page+1}"
-            try:
-                next_response = session.get(next_url, timeout=15)
-                next_response.raise_for_status()
-                
-                next_businesses = extract_businesses_from_html(next_response.text, keyword)
-                if not next_businesses:
-                    break  # No more results
-                
-                businesses.extend(next_businesses)
-            except:
-                break  # Stop if we can't get more pages
+        # The page offsets are all known up front, so fetch them in parallel
+        # (staggered) instead of a serial fetch + 2s sleep per page, then
+        # process in page order: hash-dedupe first, parse only fresh bodies
+        if max_pages > 1:
+            next_urls = [f"{base_url}?page={page+1}" for page in range(1, max_pages)]
+            with ThreadPoolExecutor(max_workers=min(4, len(next_urls))) as pages:
+                bodies = list(pages.map(lambda u: _fetch_page(u, headers), next_urls))
+
+            seen_pages = set()
+            for body in bodies:
+                if body is None or _blocked(body):
+                    break  # Fetch failed or we're throttled; stop here
+
+                page_hash = hashlib.blake2b(body, digest_size=8).digest()
+                if page_hash in seen_pages:
+                    break  # Same page again; no parse needed
+                seen_pages.add(page_hash)
+
+                before = len(businesses)
+                _add_new(extract_businesses_from_html(body, keyword))
+                if len(businesses) == before:
+                    break  # No new results
                 
     except requests.RequestException as e:
-        st.error(f"Error scraping {keyword}: {str(e)}")
-    
+        errors.append(f"Error scraping {keyword}: {str(e)}")
+
     return businesses
 
-def scrape_google_maps_api_approach(keyword):
+def scrape_google_maps_api_approach(keyword, search_url=None, errors=None):
     """Alternative approach using Google's internal APIs"""
     businesses = []
+    if errors is None:
+        errors = []
     
     # This is a simplified simulation - actual implementation would need
     # to reverse-engineer Google's internal API calls
     
-    query = quote_plus(keyword)
-    search_url = f"https://www.google.com/maps/search/{query}"
+    if search_url is None:
+        search_url = _search_url(keyword)
     
     headers = {
-        'User-Agent': ua.random,
+        'User-Agent': random_user_agent(),
         'Accept': '*/*',
         'Accept-Language': 'en-US,en;q=0.9',
         'Referer': 'https://www.google.com/',
@@ -168,13 +567,124 @@ def scrape_google_maps_api_approach(keyword):
     }
     
     try:
-        response = requests.get(search_url, headers=headers, timeout=15)
-        businesses = extract_businesses_from_html(response.text, keyword)
+        response = _session.get(search_url, headers=headers, timeout=15)
+        if _blocked(response.content):
+            return []
+        # Pass bytes: lxml sniffs the meta charset in C, skipping requests'
+        # Python-side encoding detection for .text
+        businesses = extract_businesses_from_html(response.content, keyword)
     except Exception as e:
-        st.error(f"Error with API approach for {keyword}: {str(e)}")
-    
+        errors.append(f"Error with API approach for {keyword}: {str(e)}")
+
     return businesses
 
+# Contact emails live in headers/footers, so they almost always appear in
+# the first few hundred KB; reading past that only buys memory pressure on
+# bloated single-page-app sites
+_EMAIL_SCAN_CAP = 256 * 1024
+
+# Bytes twin of _EMAIL_RE for probing chunks mid-download
+_EMAIL_BYTES_RE = re.compile(_EMAIL_RE.pattern.encode('ascii'))
+
+
+def extract_email_from_website(url):
+    """Fetch a business website and try to find a contact email
+
+    Reads at most _EMAIL_SCAN_CAP bytes of the page, stopping the download
+    early once an email-shaped token has streamed past, then checks mailto:
+    links first — a cheap attribute scan — and only falls back to the
+    full-text regex pass when no explicit link exists.
+    """
+    headers = {'User-Agent': random_user_agent()}
+
+    try:
+        with _session.get(url, headers=headers, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            chunks = []
+            read = 0
+            # Keep a small tail from the previous chunk so an address split
+            # across a chunk boundary still trips the probe
+            overlap = b''
+            draining = False
+            for chunk in response.iter_content(chunk_size=16384):
+                chunks.append(chunk)
+                read += len(chunk)
+                if read >= _EMAIL_SCAN_CAP or draining:
+                    break
+                if b'mailto:' in chunk or _EMAIL_BYTES_RE.search(overlap + chunk):
+                    # The probed token may straddle this chunk's end; pull
+                    # one more chunk so a split address (or mailto href)
+                    # finishes streaming before the parse
+                    draining = True
+                    continue
+                overlap = chunk[-64:]
+            body = b''.join(chunks)
+    except Exception:
+        return NA
+
+    from lxml import html as lxml_html
+
+    try:
+        tree = lxml_html.fromstring(body)
+    except Exception:
+        return NA
+
+    mailtos = tree.xpath('//a[starts-with(@href, "mailto:")]/@href')
+    for href in mailtos:
+        email = href[7:].split('?')[0].strip()
+        if email:
+            return email
+
+    email_match = _EMAIL_RE.search(' '.join(tree.itertext()))
+    return email_match.group(0) if email_match else NA
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def scrape_keyword(keyword, max_pages, delay):
+    """Scrape one keyword, trying each approach, under the shared rate limiter
+
+    Cached for an hour per (keyword, max_pages, delay): repeat keywords in
+    iterative sessions are served from Streamlit's cache without burning
+    requests (or CAPTCHA budget) on Google.
+
+    Returns (results, errors); this runs in worker threads where st.*
+    calls are dropped, so error messages travel back with the results for
+    main() to render.
+
+    Raises RuntimeError when every approach comes back empty: exceptions
+    are not cached, so a transient block or outage doesn't pin an empty
+    result for the keyword for the rest of the TTL.
+    """
+    # Wait for an admission slot instead of sleeping a flat delay; the
+    # limiter serializes request starts across workers with jitter
+    _rate_limiter.acquire()
+
+    # Prefer the structured APP_INITIALIZATION_STATE payload; it carries the
+    # same records as the HTML without any per-card parsing heuristics
+    # Encode the keyword and build the search URL once for all approaches
+    search_url = _search_url(keyword)
+
+    errors = []
+    results = []
+    data = get_initial_data(keyword, search_url, errors)
+    if data:
+        results = extract_businesses_from_app_state(data, keyword)
+
+    # Fall back to HTML scraping when the blob is missing or changes shape
+    if not results:
+        results = scrape_with_pagination(keyword, max_pages, search_url, errors)
+
+    # If that fails too, try the alternative fetch
+    if not results:
+        results = scrape_google_maps_api_approach(keyword, search_url, errors)
+
+    if not results:
+        raise RuntimeError('; '.join(errors) if errors else 'no businesses found')
+
+    _rate_limiter.report_success()
+    return results, errors
+
+MAX_WORKERS = 4
+
 def main():
     st.set_page_config(page_title="Google Maps Bulk Scraper", layout="wide")
     st.title("🗺️ Google Maps Bulk Business Scraper")
@@ -200,19 +710,25 @@ def main():
     )
     
     # Scraping controls
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     with col1:
         delay = st.slider("Delay between requests (seconds)", 1, 10, 3)
     with col2:
         max_pages = st.slider("Max pages per keyword", 1, 10, 3)
-    
+    with col3:
+        workers = st.slider("Parallel workers", 1, 8, MAX_WORKERS)
+
+    extract_emails = st.checkbox("Extract emails from business websites (slower)")
+
     # Start scraping button
     if st.button("🚀 Start Scraping", use_container_width=True):
         if not keywords_input.strip():
             st.warning("Please enter at least one keyword")
             return
         
-        keywords = [kw.strip() for kw in keywords_input.split('\n') if kw.strip()]
+        # dict.fromkeys drops intra-batch duplicates while preserving order
+        keywords = list(dict.fromkeys(
+            kw.strip() for kw in keywords_input.split('\n') if kw.strip()))
         if not keywords:
             st.warning("Please enter valid keywords")
             return
@@ -221,37 +737,90 @@ def main():
         
         progress_bar = st.progress(0)
         status_text = st.empty()
+        table_slot = st.empty()
+        results_table = table_slot.dataframe(
+            pd.DataFrame(columns=COLUMNS), use_container_width=True)
+
+        # Base admission rate comes from the user's delay slider
+        _rate_limiter.configure(delay)
+
+        # Fetches are network-bound, so scrape keywords in parallel with a
+        # small thread pool instead of one blocking request at a time
+        with ThreadPoolExecutor(max_workers=min(workers, len(keywords))) as executor:
+            futures = {
+                executor.submit(scrape_keyword, keyword, max_pages, delay): keyword
+                for keyword in keywords
+            }
+
+            # Dedupe as results arrive: an O(1) set probe per business instead
+            # of a post-hoc O(N^2)-ish scan over accumulated rows
+            seen = set()
+            done = 0
+            for future in as_completed(futures):
+                keyword = futures[future]
+                done += 1
+                status_text.info(f"Scraped: {keyword} ({done}/{len(keywords)})")
+                # A keyword that yields nothing raises instead of returning
+                # [], so the failure is reported here rather than cached;
+                # catch broadly so one bad keyword can't kill the batch
+                try:
+                    rows, errors = future.result()
+                except Exception as e:
+                    st.warning(f"Scraping {keyword} failed: {e}")
+                    progress_bar.progress(done / len(keywords))
+                    continue
+                # Worker-side st.* calls are no-ops; render their messages here
+                for message in errors:
+                    st.warning(message)
+                new_rows = []
+                for business in rows:
+                    key = (business["Business Name"], business["Address"])
+                    if key not in seen:
+                        seen.add(key)
+                        all_results.append(business)
+                        new_rows.append(business)
+                # Append just-arrived rows so the table fills while the
+                # remaining keywords are still in flight
+                if new_rows:
+                    results_table.add_rows(pd.DataFrame(new_rows, columns=COLUMNS))
+                progress_bar.progress(done / len(keywords))
         
-        for i, keyword in enumerate(keywords):
-            status_text.info(f"Scraping: {keyword} ({i+1}/{len(keywords)})")
-            
-            # Try different approaches
-            results = scrape_with_pagination(keyword, max_pages)
-            
-            # If first approach fails, try alternative
-            if not results:
-                results = scrape_google_maps_api_approach(keyword)
-            
-            all_results.extend(results)
-            progress_bar.progress((i + 1) / len(keywords))
-            
-            # Delay between requests
-            if i < len(keywords) - 1:
-                time.sleep(delay)
-        
+        # Optional second stage: visit each business website for an email.
+        # Multi-location chains share a website, so fetch each distinct URL
+        # once and fan the result back out; the sites are independent hosts,
+        # so fetch them in parallel instead of one blocking request at a time
+        if extract_emails and all_results:
+            unique_sites = list({b["Website"] for b in all_results
+                                 if b["Website"].startswith('http')})
+            if unique_sites:
+                emails_by_site = {}
+                with ThreadPoolExecutor(max_workers=min(8, len(unique_sites))) as executor:
+                    email_futures = {
+                        executor.submit(extract_email_from_website, url): url
+                        for url in unique_sites
+                    }
+                    done = 0
+                    for future in as_completed(email_futures):
+                        emails_by_site[email_futures[future]] = future.result()
+                        done += 1
+                        status_text.info(f"Extracting emails: {done}/{len(unique_sites)} websites")
+                        progress_bar.progress(done / len(unique_sites))
+                for business in all_results:
+                    email = emails_by_site.get(business["Website"])
+                    if email:
+                        business["Email"] = email
+
         # Convert to DataFrame
         if all_results:
-            df = pd.DataFrame(all_results)
-            
-            # Remove duplicates based on business name and address
-            df = df.drop_duplicates(subset=['Business Name', 'Address'])
-            
-            # Display results
+            # Already deduplicated on (name, address) during accumulation
+            df = pd.DataFrame(all_results, columns=COLUMNS)
+
+            # Final render into the same slot (picks up extracted emails)
             st.success(f"✅ Scraping completed! Found {len(df)} unique businesses")
-            st.dataframe(df, use_container_width=True)
-            
+            table_slot.dataframe(df, use_container_width=True)
+
             # Download button
-            csv = df.to_csv(index=False)
+            csv = _results_to_csv(all_results)
             st.download_button(
                 label="💾 Download CSV",
                 data=csv,